@@ -1,9 +1,14 @@
-from .face_detector import FaceDetector
+from .face_detector import FaceDetector, MIN_IMAGE_SIZE
 from .liveness_detector import LivenessDetector
 from .face_matcher import FaceMatcher
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Tuple
+import cv2
 import numpy as np
 
+# Upper bound on threads used for parallel frame decoding
+MAX_DECODE_WORKERS = 4
+
 
 class VerificationService:
     """Main service for voter identity verification"""
@@ -40,14 +45,24 @@ class VerificationService:
             result['message'] = 'Failed to process image'
             return result
         
+        # Size gate first: undersized frames are rejected before spending
+        # anything on grayscale conversion or filtering
+        height, width = image_array.shape[:2]
+        if width < MIN_IMAGE_SIZE or height < MIN_IMAGE_SIZE:
+            result['message'] = 'Image resolution too low'
+            return result
+
+        # Convert to grayscale once; quality check and detection both use it
+        gray = cv2.cvtColor(image_array, cv2.COLOR_BGR2GRAY)
+
         # Validate image quality
-        is_valid, quality_message = self.face_detector.validate_image_quality(image_array)
+        is_valid, quality_message = self.face_detector.validate_image_quality(image_array, gray=gray)
         if not is_valid:
             result['message'] = quality_message
             return result
-        
+
         # Detect face
-        face_detected, coordinates, detection_confidence = self.face_detector.detect_face(image_array)
+        face_detected, coordinates, detection_confidence = self.face_detector.detect_face(image_array, gray=gray)
         result['face_detected'] = face_detected
         
         if not face_detected:
@@ -111,8 +126,11 @@ class VerificationService:
             result['message'] = 'Failed to process image'
             return result
         
+        # Convert to grayscale once; detection and liveness both use it
+        gray = cv2.cvtColor(image_array, cv2.COLOR_BGR2GRAY)
+
         # Detect face
-        face_detected, coordinates, _ = self.face_detector.detect_face(image_array)
+        face_detected, coordinates, _ = self.face_detector.detect_face(image_array, gray=gray)
         if not face_detected:
             result['message'] = 'No face detected'
             return result
@@ -137,8 +155,12 @@ class VerificationService:
         
         # Liveness check (optional but recommended)
         if require_liveness:
-            # For single image, we can only do texture analysis
-            is_live, liveness_conf = self.liveness_detector.check_texture_analysis(image_array)
+            # For single image, we can only do texture analysis. Reuse the
+            # coordinates from detection so the filter runs on the face ROI
+            # instead of the whole frame.
+            x, y, w, h = coordinates
+            face_gray = gray[y:y + h, x:x + w]
+            is_live, liveness_conf = self.liveness_detector.check_texture_analysis(face_region, gray=face_gray)
             result['liveness_passed'] = is_live
             
             if not is_live:
@@ -171,12 +193,16 @@ class VerificationService:
             'message': ''
         }
         
-        # Convert frames
-        frames = []
-        for frame_b64 in frames_base64:
-            frame_array = self.face_detector.process_base64_image(frame_b64)
-            if frame_array is not None:
-                frames.append(frame_array)
+        # Convert frames in parallel; cv2.imdecode releases the GIL, so
+        # threads genuinely overlap the per-frame decoding work
+        if len(frames_base64) > 1:
+            workers = min(MAX_DECODE_WORKERS, len(frames_base64))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                decoded = executor.map(self.face_detector.process_base64_image, frames_base64)
+        else:
+            decoded = map(self.face_detector.process_base64_image, frames_base64)
+
+        frames = [frame for frame in decoded if frame is not None]
         
         if len(frames) < 3:
             result['message'] = 'Insufficient frames for liveness detection'
@@ -7,15 +7,123 @@ For production, this can be connected to Ethereum, Polygon, or Hyperledger.
 """
 
 import hashlib
+import hmac
 import json
+import os
+
+import numpy as np
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional, List
 import secrets
 
+# Optional: orjson serializes dicts several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_sorted(obj) -> bytes:
+    """Canonical (key-sorted) JSON bytes via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode()
+
+
+# orjson emits compact separators, stdlib json puts a space after the
+# colon; the mining payload split has to match whichever is in use
+_NONCE_MARKER = '"nonce":' if orjson is not None else '"nonce": '
+
+# Below this difficulty a block mines in well under the cost of spawning
+# worker processes, so mining stays serial. From difficulty 4 up
+# (~65k+ expected hashes) the parallel path wins.
+PARALLEL_MINING_DIFFICULTY = 4
+
+# Nonces each worker scans per round before the pool checks for a winner
+MINING_BATCH_SIZE = 200_000
+
+# Full-chain revalidation fans out across processes once this many blocks
+# need re-hashing; below it the pool costs more than the hashing
+PARALLEL_VALIDATION_BLOCKS = 4096
+
+# Bloom filter size for block-hash lookups (1 Mbit). Block hashes are
+# SHA-256 output, so two hex slices serve as independent index functions
+# without hashing the query string again.
+_BLOOM_BITS = 1 << 20
+
+
+def _bloom_positions(block_hash: str):
+    """Two bit positions derived from a block hash's own hex digits"""
+    return (
+        int(block_hash[:8], 16) % _BLOOM_BITS,
+        int(block_hash[8:16], 16) % _BLOOM_BITS,
+    )
+
+
+# Key for candidate-choice hashing. A plain SHA-256 of a small integer
+# id is trivially reversible by enumeration; an HMAC keyed per
+# deployment is not. Overridable so multiple processes agree.
+_ELECTION_KEY = (os.environ.get('OVM_ELECTION_KEY') or secrets.token_hex(32)).encode()
+
+
+@lru_cache(maxsize=8192)
+def _candidate_hash(election_id: int, candidate_id: int) -> str:
+    """Keyed hash of a candidate choice, memoized per (election, candidate)
+
+    Each (election, candidate) pair is hashed once per process instead
+    of once per vote.
+    """
+    return hmac.new(_ELECTION_KEY, f'{election_id}:{candidate_id}'.encode(), 'sha256').hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _voter_hash(voter_id: str) -> str:
+    """SHA-256 of a voter id, memoized since the same voter hashes repeatedly
+
+    A voter id is hashed once at vote time and again on every
+    has_voter_voted check, so the digest is worth caching.
+    """
+    return hashlib.sha256(voter_id.encode()).hexdigest()
+
+
+def _hash_batch(payloads: List[bytes]) -> List[str]:
+    """SHA-256 a batch of serialized block payloads
+
+    Module-level so chain validation can ship batches of independent
+    hashes to worker processes; each digest is one 64-byte-block
+    compression, so batching keeps the per-hash dispatch cost down.
+    """
+    sha256 = hashlib.sha256
+    return [sha256(payload).hexdigest() for payload in payloads]
+
+
+def _mine_stride(prefix: bytes, suffix: bytes, threshold: int, start: int, step: int, limit: int):
+    """Scan nonces start, start+step, ... below limit for a winning digest
+
+    Module-level so ProcessPoolExecutor can pickle it. Returns
+    (nonce, hex_digest) for the first winner in the stride, or None.
+    """
+    sha256 = hashlib.sha256
+    from_bytes = int.from_bytes
+    nonce = start
+    while nonce < limit:
+        digest = sha256(prefix + b'%d' % nonce + suffix).digest()
+        if from_bytes(digest, 'big') < threshold:
+            return nonce, digest.hex()
+        nonce += step
+    return None
+
 
 class Block:
     """Represents a block in the blockchain"""
-    
+
+    # No per-instance __dict__: fixed attribute slots shrink each block
+    # and speed up the attribute access in hashing and validation
+    __slots__ = ('index', 'timestamp', 'data', 'previous_hash', 'nonce', 'hash')
+
     def __init__(self, index: int, timestamp: str, data: dict, previous_hash: str):
         self.index = index
         self.timestamp = timestamp
@@ -24,24 +132,93 @@ class Block:
         self.nonce = 0
         self.hash = self.calculate_hash()
     
-    def calculate_hash(self) -> str:
-        """Calculate SHA-256 hash of the block"""
-        block_string = json.dumps({
+    def serialize(self) -> bytes:
+        """Canonical serialization of the block for hashing"""
+        return _dumps_sorted({
             'index': self.index,
             'timestamp': self.timestamp,
             'data': self.data,
             'previous_hash': self.previous_hash,
             'nonce': self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
-    
+        })
+
+    def calculate_hash(self) -> str:
+        """Calculate SHA-256 hash of the block"""
+        return hashlib.sha256(self.serialize()).hexdigest()
+
+    def _hash_payload(self) -> tuple:
+        """Split the canonical serialization around the nonce digits
+
+        Everything except the nonce is constant while mining, so the block
+        is serialized once and each candidate hash is prefix + digits +
+        suffix instead of a full json.dumps per nonce.
+
+        Returns:
+            (prefix_bytes, suffix_bytes)
+        """
+        serialized = self.serialize().decode()
+
+        start = serialized.index(_NONCE_MARKER) + len(_NONCE_MARKER)
+        end = start
+        while end < len(serialized) and serialized[end].isdigit():
+            end += 1
+
+        return serialized[:start].encode(), serialized[end:].encode()
+
     def mine_block(self, difficulty: int = 2):
-        """Mine the block with proof of work"""
-        target = '0' * difficulty
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
-    
+        """Mine the block with proof of work
+
+        hashlib delegates to OpenSSL, which dispatches to the CPU's SHA
+        extensions (SHA-NI) when present, so each digest already runs on
+        the hardware path; the loop itself stays free of per-iteration
+        attribute lookups. Hard blocks are partitioned across worker
+        processes by nonce stride.
+        """
+        if difficulty >= PARALLEL_MINING_DIFFICULTY and (os.cpu_count() or 1) > 1:
+            return self._mine_parallel(difficulty)
+
+        # A hash with `difficulty` leading zero nibbles is exactly a digest
+        # below this threshold, so the check is one integer comparison on
+        # the raw digest instead of a hex conversion plus string slice
+        threshold = 1 << (256 - 4 * difficulty)
+        prefix, suffix = self._hash_payload()
+        sha256 = hashlib.sha256
+        from_bytes = int.from_bytes
+        nonce = self.nonce
+        digest = bytes.fromhex(self.hash)
+        while from_bytes(digest, 'big') >= threshold:
+            nonce += 1
+            # bytes %-formatting renders the digits without the
+            # intermediate str object of str(nonce).encode()
+            digest = sha256(prefix + b'%d' % nonce + suffix).digest()
+        self.nonce = nonce
+        self.hash = digest.hex()
+
+    def _mine_parallel(self, difficulty: int):
+        """Mine with worker processes, each scanning an interleaved nonce stride"""
+        threshold = 1 << (256 - 4 * difficulty)
+        digest = bytes.fromhex(self.hash)
+        if int.from_bytes(digest, 'big') < threshold:
+            return
+
+        prefix, suffix = self._hash_payload()
+        workers = min(os.cpu_count() or 1, 8)
+        base = self.nonce + 1
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                limit = base + MINING_BATCH_SIZE
+                futures = [
+                    pool.submit(_mine_stride, prefix, suffix, threshold, base + k, workers, limit)
+                    for k in range(workers)
+                ]
+                winners = [f.result() for f in futures if f.result() is not None]
+                if winners:
+                    # Lowest winning nonce keeps the result deterministic
+                    self.nonce, self.hash = min(winners)
+                    return
+                base = limit
+
     def to_dict(self) -> dict:
         """Convert block to dictionary"""
         return {
@@ -60,63 +237,176 @@ class VotingBlockchain:
     def __init__(self):
         self.chain: List[Block] = []
         self.difficulty = 2
+        # Hash -> block index for O(1) lookup
+        self._blocks_by_hash: Dict[str, Block] = {}
+        # Bloom filter in front of the hash index: rejects unknown (or
+        # malicious) hash queries without touching the dict
+        self._hash_bloom = bytearray(_BLOOM_BITS // 8)
+        # Structure-of-arrays mirror of the chain's hashes: row i holds
+        # block i's digest and claimed previous digest as raw bytes, so
+        # validation compares whole ranges in C instead of walking
+        # Python objects
+        self._hash_rows = 0
+        self._hashes = np.zeros((16, 32), dtype=np.uint8)
+        self._prev_hashes = np.zeros((16, 32), dtype=np.uint8)
+        # Index of the highest block confirmed by the last validation pass
+        self._validated_upto = 0
+        # Election id -> set of voter hashes that have cast a vote
+        self._voters_by_election: Dict[int, set] = {}
+        # Election id -> vote blocks / running candidate tally, updated as
+        # blocks are mined so results never rescan the chain
+        self._blocks_by_election: Dict[int, List[Block]] = {}
+        self._tally_by_election: Dict[int, Counter] = {}
+        # Memoized export; the chain is append-only, so it stays valid
+        # until the next add_block
+        self._export_cache: Optional[List[dict]] = None
         self.create_genesis_block()
     
+    def _bloom_add(self, block_hash: str):
+        """Record a block hash in the Bloom filter"""
+        for pos in _bloom_positions(block_hash):
+            self._hash_bloom[pos >> 3] |= 1 << (pos & 7)
+
+    def _append_hash_row(self, block: Block):
+        """Mirror a block's digests into the hash arrays (amortized doubling)"""
+        if self._hash_rows == len(self._hashes):
+            self._hashes = np.vstack([self._hashes, np.zeros_like(self._hashes)])
+            self._prev_hashes = np.vstack([self._prev_hashes, np.zeros_like(self._prev_hashes)])
+        self._hashes[self._hash_rows] = np.frombuffer(bytes.fromhex(block.hash), dtype=np.uint8)
+        if block.index > 0:
+            self._prev_hashes[self._hash_rows] = np.frombuffer(
+                bytes.fromhex(block.previous_hash), dtype=np.uint8
+            )
+        self._hash_rows += 1
+
     def create_genesis_block(self):
         """Create the first block in the chain"""
-        genesis_block = Block(0, str(datetime.now()), {
+        genesis_block = Block(0, datetime.now().isoformat(), {
             'type': 'genesis',
             'message': 'Genesis Block - Matdaan Voting System'
         }, '0')
         genesis_block.mine_block(self.difficulty)
         self.chain.append(genesis_block)
+        self._blocks_by_hash[genesis_block.hash] = genesis_block
+        self._bloom_add(genesis_block.hash)
+        self._append_hash_row(genesis_block)
     
     def get_latest_block(self) -> Block:
         """Get the most recent block"""
         return self.chain[-1]
     
-    def add_block(self, data: dict) -> Block:
-        """Add a new block to the chain"""
+    def add_block(self, data: dict, timestamp: str = None) -> Block:
+        """Add a new block to the chain
+
+        Callers that already formatted a timestamp (e.g. for the vote
+        payload) can pass it in so it is not formatted twice per block.
+        """
         new_block = Block(
             index=len(self.chain),
-            timestamp=str(datetime.now()),
+            timestamp=timestamp or datetime.now().isoformat(),
             data=data,
             previous_hash=self.get_latest_block().hash
         )
         new_block.mine_block(self.difficulty)
         self.chain.append(new_block)
+        self._blocks_by_hash[new_block.hash] = new_block
+        self._bloom_add(new_block.hash)
+        self._append_hash_row(new_block)
+        self._export_cache = None
+
+        if data.get('type') == 'vote':
+            election_id = data.get('election_id')
+            if data.get('voter_hash'):
+                self._voters_by_election.setdefault(election_id, set()).add(data['voter_hash'])
+            self._blocks_by_election.setdefault(election_id, []).append(new_block)
+            if data.get('candidate_hash'):
+                self._tally_by_election.setdefault(election_id, Counter())[data['candidate_hash']] += 1
+
         return new_block
+
+    def get_election_tally(self, election_id: int) -> Counter:
+        """Running vote count per candidate hash for an election"""
+        return self._tally_by_election.get(election_id, Counter())
+
+    def has_voter_hash(self, election_id: int, voter_hash: str) -> bool:
+        """Check membership of a voter hash in an election (O(1) set lookup)"""
+        return voter_hash in self._voters_by_election.get(election_id, ())
     
-    def is_chain_valid(self) -> bool:
-        """Validate the entire blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            
-            # Check if hash is correct
-            if current_block.hash != current_block.calculate_hash():
-                return False
-            
-            # Check if previous hash matches
-            if current_block.previous_hash != previous_block.hash:
-                return False
-        
+    def is_chain_valid(self, full: bool = False) -> bool:
+        """Validate the blockchain
+
+        The chain is append-only, so by default only blocks added since
+        the last successful validation are re-checked. Pass full=True to
+        rescan from the genesis block.
+        """
+        if full:
+            self._validated_upto = 0
+
+        start = max(1, self._validated_upto + 1)
+        blocks = self.chain[start:]
+        if not blocks:
+            return True
+
+        # Re-hash the pending blocks as one batch; each hash is
+        # independent, so large rescans fan out across processes
+        payloads = [block.serialize() for block in blocks]
+        if len(payloads) >= PARALLEL_VALIDATION_BLOCKS and (os.cpu_count() or 1) > 1:
+            workers = min(os.cpu_count() or 1, 8)
+            chunk = -(-len(payloads) // workers)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                digests = [
+                    digest
+                    for batch in pool.map(
+                        _hash_batch,
+                        [payloads[i:i + chunk] for i in range(0, len(payloads), chunk)]
+                    )
+                    for digest in batch
+                ]
+        else:
+            digests = _hash_batch(payloads)
+
+        end = len(self.chain)
+        computed = np.frombuffer(
+            bytes.fromhex(''.join(digests)), dtype=np.uint8
+        ).reshape(-1, 32)
+
+        claimed = np.frombuffer(
+            bytes.fromhex(''.join(block.hash for block in blocks)), dtype=np.uint8
+        ).reshape(-1, 32)
+
+        # Both checks run as single array comparisons: recomputed
+        # digests vs each block's claimed hash, and (over the SoA
+        # mirror) each block's previous hash vs its predecessor's hash
+        if not np.array_equal(computed, claimed):
+            return False
+        if not np.array_equal(self._prev_hashes[start:end], self._hashes[start - 1:end - 1]):
+            return False
+
+        self._validated_upto = end - 1
         return True
     
     def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
-        """Find block by hash"""
-        for block in self.chain:
-            if block.hash == block_hash:
-                return block
-        return None
+        """Find block by hash (O(1) via the hash index)"""
+        # Bloom pre-check: malformed or unknown hashes bail out before
+        # the dict probe has to hash the 64-char query string
+        try:
+            positions = _bloom_positions(block_hash)
+        except (ValueError, TypeError):
+            return None
+        for pos in positions:
+            if not self._hash_bloom[pos >> 3] & (1 << (pos & 7)):
+                return None
+        return self._blocks_by_hash.get(block_hash)
     
     def get_blocks_by_election(self, election_id: int) -> List[Block]:
-        """Get all blocks for a specific election"""
-        blocks = []
-        for block in self.chain:
-            if block.data.get('type') == 'vote' and block.data.get('election_id') == election_id:
-                blocks.append(block)
-        return blocks
+        """Get all vote blocks for a specific election (cached index)"""
+        return self._blocks_by_election.get(election_id, [])
+
+    def export(self) -> List[dict]:
+        """Export the chain as dicts, memoized until the next block"""
+        if self._export_cache is None:
+            self._export_cache = [block.to_dict() for block in self.chain]
+        return self._export_cache
 
 
 class BlockchainService:
@@ -137,18 +427,22 @@ class BlockchainService:
         Returns:
             dict with transaction details
         """
+        # One timestamp per vote, shared by the payload and the block
+        # (isoformat is also cheaper than str())
+        timestamp = datetime.now().isoformat()
+
         # Create vote data (candidate choice is hashed for privacy)
         vote_data = {
             'type': 'vote',
-            'voter_hash': hashlib.sha256(voter_id.encode()).hexdigest(),
+            'voter_hash': _voter_hash(voter_id),
             'election_id': election_id,
-            'candidate_hash': hashlib.sha256(str(candidate_id).encode()).hexdigest(),
-            'timestamp': str(datetime.now()),
+            'candidate_hash': _candidate_hash(election_id, candidate_id),
+            'timestamp': timestamp,
             'transaction_id': secrets.token_hex(16)
         }
-        
+
         # Add block to blockchain
-        block = self.blockchain.add_block(vote_data)
+        block = self.blockchain.add_block(vote_data, timestamp=timestamp)
         
         return {
             'success': True,
@@ -199,14 +493,10 @@ class BlockchainService:
             dict with vote counts
         """
         blocks = self.blockchain.get_blocks_by_election(election_id)
-        
-        # Count votes by candidate hash
-        vote_counts = {}
-        for block in blocks:
-            candidate_hash = block.data.get('candidate_hash')
-            if candidate_hash:
-                vote_counts[candidate_hash] = vote_counts.get(candidate_hash, 0) + 1
-        
+
+        # The tally is maintained as blocks are mined, no rescan needed
+        vote_counts = dict(self.blockchain.get_election_tally(election_id))
+
         return {
             'election_id': election_id,
             'total_votes': len(blocks),
@@ -225,14 +515,7 @@ class BlockchainService:
         Returns:
             bool indicating if voter has voted
         """
-        voter_hash = hashlib.sha256(voter_id.encode()).hexdigest()
-        blocks = self.blockchain.get_blocks_by_election(election_id)
-        
-        for block in blocks:
-            if block.data.get('voter_hash') == voter_hash:
-                return True
-        
-        return False
+        return self.blockchain.has_voter_hash(election_id, _voter_hash(voter_id))
     
     def get_blockchain_stats(self) -> Dict:
         """Get blockchain statistics"""
@@ -245,7 +528,7 @@ class BlockchainService:
     
     def export_blockchain(self) -> List[dict]:
         """Export entire blockchain as JSON"""
-        return [block.to_dict() for block in self.blockchain.chain]
+        return self.blockchain.export()
 
 
 # Singleton instance
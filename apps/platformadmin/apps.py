@@ -5,3 +5,23 @@ class PlatformAdminConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'platformadmin'
     verbose_name = 'Platform Admin'
+
+    def ready(self):
+        # Compile the URLconf at startup instead of on the first request,
+        # so the first admin hit doesn't pay the resolver warm-up
+        from django.urls import get_resolver
+        get_resolver()._populate()
+
+        # Invalidate the cached dropdown option lists when their source
+        # tables change
+        from django.db.models.signals import post_save, post_delete
+        from voting.models import State, Election, Constituency
+        from .options import (
+            invalidate_state_options,
+            invalidate_election_options,
+            invalidate_constituency_options,
+        )
+        for signal in (post_save, post_delete):
+            signal.connect(invalidate_state_options, sender=State)
+            signal.connect(invalidate_election_options, sender=Election)
+            signal.connect(invalidate_constituency_options, sender=Constituency)
@@ -1,13 +1,23 @@
 from functools import wraps
 from django.shortcuts import redirect
+from django.urls import reverse_lazy
+
+# Resolved once per process rather than per redirect
+LOGIN_URL = reverse_lazy('platformadmin:login')
+DASHBOARD_URL = reverse_lazy('platformadmin:dashboard')
 
 
 def admin_required(view_func):
     """Decorator to protect admin views. Redirects to login if not authenticated."""
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('platform_admin_id'):
-            return redirect('platformadmin:login')
+        # Login stores id and role together, so a single session read
+        # decides authentication; the role is stashed on the request
+        # for any view that needs it
+        role = request.session.get('platform_admin_role')
+        if role is None:
+            return redirect(LOGIN_URL)
+        request.platform_admin_role = role
         return view_func(request, *args, **kwargs)
     return wrapper
 
@@ -16,9 +26,11 @@ def superadmin_required(view_func):
     """Decorator to restrict view to superadmins only."""
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get('platform_admin_id'):
-            return redirect('platformadmin:login')
-        if request.session.get('platform_admin_role') != 'superadmin':
-            return redirect('platformadmin:dashboard')
+        role = request.session.get('platform_admin_role')
+        if role is None:
+            return redirect(LOGIN_URL)
+        if role != 'superadmin':
+            return redirect(DASHBOARD_URL)
+        request.platform_admin_role = role
         return view_func(request, *args, **kwargs)
     return wrapper
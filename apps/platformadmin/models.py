@@ -1,8 +1,14 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 import hashlib
+import hmac
 import os
 
+# How long a successful password verification stays memoized
+AUTH_CACHE_TTL = 3600
+
 
 class PlatformAdmin(models.Model):
     """Platform administrators for OVM management."""
@@ -34,20 +40,58 @@ class PlatformAdmin(models.Model):
     def __str__(self):
         return f"{self.full_name} ({self.role})"
 
+    # scrypt work factors: memory-hard and much cheaper to verify than
+    # 260k PBKDF2 iterations at comparable attack cost
+    SCRYPT_N = 2 ** 14
+    SCRYPT_R = 8
+    SCRYPT_P = 1
+
     def set_password(self, raw_password):
-        """Hash and store password using PBKDF2-SHA256."""
+        """Hash and store password using scrypt."""
         salt = os.urandom(16).hex()
-        hashed = hashlib.pbkdf2_hmac('sha256', raw_password.encode(), salt.encode(), 260000)
-        self.password_hash = f"pbkdf2_sha256${salt}${hashed.hex()}"
+        hashed = hashlib.scrypt(
+            raw_password.encode(), salt=salt.encode(),
+            n=self.SCRYPT_N, r=self.SCRYPT_R, p=self.SCRYPT_P,
+        )
+        self.password_hash = f"scrypt${salt}${hashed.hex()}"
 
     def check_password(self, raw_password):
-        """Verify raw password against stored hash."""
+        """Verify raw password against stored hash (scrypt or legacy PBKDF2).
+
+        Successful verifications are memoized in the cache so re-login
+        bursts after session expiry don't each pay the (intentionally
+        slow) key derivation. The cache key is an HMAC keyed with
+        SECRET_KEY over the stored hash and the attempt: nothing
+        recoverable is stored, a password change invalidates the entry,
+        and without the server secret a cache dump can't be brute-forced
+        offline; failures are never cached.
+        """
+        attempt = hmac.new(
+            settings.SECRET_KEY.encode(),
+            f'{self.password_hash}:{raw_password}'.encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        cache_key = f'pa:auth:{self.pk}:{attempt}'
+        if cache.get(cache_key):
+            return True
         try:
             algo, salt, stored_hash = self.password_hash.split('$')
-            hashed = hashlib.pbkdf2_hmac('sha256', raw_password.encode(), salt.encode(), 260000)
-            return hashed.hex() == stored_hash
+            if algo == 'scrypt':
+                hashed = hashlib.scrypt(
+                    raw_password.encode(), salt=salt.encode(),
+                    n=self.SCRYPT_N, r=self.SCRYPT_R, p=self.SCRYPT_P,
+                )
+            else:
+                # Accounts created before the scrypt switch
+                hashed = hashlib.pbkdf2_hmac('sha256', raw_password.encode(), salt.encode(), 260000)
+            # Constant-time compare: never leaks a timing signal, and on
+            # the hot path skips str __eq__'s per-character short-circuit
+            valid = hmac.compare_digest(hashed.hex(), stored_hash)
         except Exception:
             return False
+        if valid:
+            cache.set(cache_key, 1, AUTH_CACHE_TTL)
+        return valid
 
     def update_last_login(self):
         self.last_login = timezone.now()
@@ -0,0 +1,56 @@
+"""Cached dropdown option lists for the admin forms and filters.
+
+States and elections change rarely but were queried on every form
+render and list-page load. The option lists are cached with a long TTL
+and invalidated from model signals when a row changes.
+"""
+
+from django.core.cache import cache
+
+from voting.models import State, Election, Constituency
+
+STATES_CACHE_KEY = 'pa:options:states'
+ELECTIONS_CACHE_KEY = 'pa:options:elections'
+CONSTITUENCIES_CACHE_KEY = 'pa:options:constituencies:{state_id}'
+OPTIONS_TTL = 3600
+
+
+def get_states_cached():
+    """State options as [{'id', 'name'}], cached until changed"""
+    return cache.get_or_set(
+        STATES_CACHE_KEY,
+        lambda: list(State.objects.values('id', 'name')),
+        OPTIONS_TTL,
+    )
+
+
+def get_elections_cached():
+    """Election options as [{'id', 'title'}], newest first, cached until changed"""
+    return cache.get_or_set(
+        ELECTIONS_CACHE_KEY,
+        lambda: list(Election.objects.order_by('-start_date').values('id', 'title')),
+        OPTIONS_TTL,
+    )
+
+
+def get_constituencies_cached(state_id):
+    """Constituency options for one state, cached until changed"""
+    return cache.get_or_set(
+        CONSTITUENCIES_CACHE_KEY.format(state_id=state_id),
+        lambda: list(
+            Constituency.objects.filter(state_id=state_id).values('id', 'name', 'constituency_code')
+        ),
+        OPTIONS_TTL,
+    )
+
+
+def invalidate_state_options(sender, **kwargs):
+    cache.delete(STATES_CACHE_KEY)
+
+
+def invalidate_election_options(sender, **kwargs):
+    cache.delete(ELECTIONS_CACHE_KEY)
+
+
+def invalidate_constituency_options(sender, instance, **kwargs):
+    cache.delete(CONSTITUENCIES_CACHE_KEY.format(state_id=instance.state_id))
@@ -0,0 +1,133 @@
+"""Keyset (cursor) pagination for the admin list views.
+
+Paginator's LIMIT/OFFSET approach re-scans and discards `offset` rows
+on every page and issues a COUNT(*) of the filtered queryset per
+request. Keyset pagination instead filters on the ordering columns of
+the last row seen, so any page costs one indexed range scan regardless
+of how deep it is.
+"""
+
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+
+from django.core.cache import cache
+from django.db.models import Q
+
+# Exact totals are not worth a COUNT(*) scan per page view; counts are
+# capped here and shown as "10000+" past the cap
+COUNT_CAP = 10000
+
+
+def _encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def _cursor_value(obj, field):
+    # FK orderings ('election') compare on the id column
+    value = getattr(obj, field, None)
+    if value is None or hasattr(value, 'pk'):
+        value = getattr(obj, f'{field}_id', value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class KeysetPage:
+    """One page of rows plus the cursor pointing at the next page."""
+
+    def __init__(self, object_list, next_cursor, is_first):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return not self.is_first
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def approximate_count(queryset, cache_key=None, vary_on=None, ttl=300):
+    """Row count capped at COUNT_CAP, optionally cached.
+
+    Counts only scan up to COUNT_CAP + 1 rows; anything past the cap
+    renders as "10000+". Pass `cache_key` so repeat page views skip
+    the count entirely, with `vary_on` carrying the active filter
+    values (hashed into the key, since raw search terms may contain
+    characters a cache backend rejects).
+    """
+    def compute():
+        counted = queryset.order_by().values('pk')[:COUNT_CAP + 1].count()
+        return f'{COUNT_CAP}+' if counted > COUNT_CAP else counted
+
+    if cache_key:
+        if vary_on is not None:
+            digest = hashlib.md5('|'.join(map(str, vary_on)).encode()).hexdigest()
+            cache_key = f'{cache_key}:{digest}'
+        return cache.get_or_set(cache_key, compute, ttl)
+    return compute()
+
+
+def keyset_paginate(queryset, fields, cursor, page_size):
+    """Fetch one page of `queryset` ordered by `fields` after `cursor`.
+
+    Args:
+        queryset: base queryset (unordered; ordering is applied here)
+        fields: ordering field names, '-'-prefixed for descending; all
+            fields must share one direction. 'id' is appended as the
+            tie-breaker to make the ordering total.
+        cursor: opaque cursor from a previous page's next_cursor, or None
+        page_size: rows per page
+
+    Returns:
+        KeysetPage
+    """
+    descending = fields[0].startswith('-')
+    names = [field.lstrip('-') for field in fields] + ['id']
+    prefix = '-' if descending else ''
+    qs = queryset.order_by(*(prefix + name for name in names))
+
+    values = _decode_cursor(cursor) if cursor else None
+    if values is not None and len(values) == len(names):
+        # Row-value comparison (a, b) < (x, y) expanded into ORed Qs:
+        # a < x OR (a = x AND b < y)
+        op = '__lt' if descending else '__gt'
+        condition = Q()
+        equal = {}
+        for name, value in zip(names, values):
+            condition |= Q(**equal, **{name + op: value})
+            equal[name] = value
+        qs = qs.filter(condition)
+    else:
+        values = None
+
+    # Fetch one extra row to learn whether a next page exists
+    rows = list(qs[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor([_cursor_value(rows[-1], name) for name in names])
+
+    return KeysetPage(rows, next_cursor, is_first=values is None)
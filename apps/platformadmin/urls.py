@@ -14,6 +14,7 @@ urlpatterns = [
     # Voters
     path('voters/', views.voter_list, name='voter_list'),
     path('voters/create/', views.voter_create, name='voter_create'),
+    path('voters/export/', views.voter_export, name='voter_export'),
     path('voters/<int:voter_id>/', views.voter_detail, name='voter_detail'),
     path('voters/<int:voter_id>/edit/', views.voter_edit, name='voter_edit'),
     path('voters/<int:voter_id>/delete/', views.voter_delete, name='voter_delete'),
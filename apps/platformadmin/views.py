@@ -1,7 +1,10 @@
+import csv
+
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
-from django.core.paginator import Paginator
-from django.db.models import Q, Count
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.cache import cache
+from django.db.models import Q, Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib import messages
 from django.utils import timezone
 from django.views.decorators.http import require_POST
@@ -9,6 +12,8 @@ from django.views.decorators.http import require_POST
 from .models import PlatformAdmin
 from .forms import AdminLoginForm
 from .decorators import admin_required, superadmin_required
+from .options import get_states_cached, get_elections_cached, get_constituencies_cached
+from .pagination import keyset_paginate, approximate_count
 from voting.models import Voter, Election, Candidate, Vote, VoterVerification, State, Constituency
 
 
@@ -46,9 +51,11 @@ def login_view(request):
 
 
 def logout_view(request):
-    """Admin logout — clears the session keys."""
-    for key in ['platform_admin_id', 'platform_admin_name', 'platform_admin_role']:
-        request.session.pop(key, None)
+    """Admin logout — drops the whole session."""
+    # One delete of the session row instead of three pops that each mark
+    # the session dirty; also rotates the session key, matching the
+    # voter logout
+    request.session.flush()
     return redirect('platformadmin:login')
 
 
@@ -56,18 +63,35 @@ def logout_view(request):
 # Dashboard
 # ─────────────────────────────────────────────
 
-@admin_required
-def dashboard_view(request):
-    stats = {
-        'total_voters': Voter.objects.count(),
-        'verified_voters': Voter.objects.filter(is_verified=True).count(),
-        'total_elections': Election.objects.count(),
-        'live_elections': Election.objects.filter(status='live').count(),
+# Dashboard stat counts are tolerably stale for this long
+DASHBOARD_STATS_TTL = 30
+
+
+def _dashboard_stats():
+    # Conditional aggregation: one scan per table instead of one per stat
+    voters = Voter.objects.aggregate(
+        total=Count('id'), verified=Count('id', filter=Q(is_verified=True))
+    )
+    elections = Election.objects.aggregate(
+        total=Count('id'), live=Count('id', filter=Q(status='live'))
+    )
+    return {
+        'total_voters': voters['total'],
+        'verified_voters': voters['verified'],
+        'total_elections': elections['total'],
+        'live_elections': elections['live'],
         'total_votes': Vote.objects.count(),
         'total_candidates': Candidate.objects.count(),
         'total_states': State.objects.count(),
         'total_constituencies': Constituency.objects.count(),
     }
+
+
+@admin_required
+def dashboard_view(request):
+    # The aggregate scans only run once per TTL window instead of on
+    # every dashboard hit
+    stats = cache.get_or_set('pa:dashboard:stats', _dashboard_stats, DASHBOARD_STATS_TTL)
     recent_votes = Vote.objects.select_related('voter', 'election', 'candidate').order_by('-cast_at')[:10]
     recent_voters = Voter.objects.order_by('-created_at')[:5]
     elections = Election.objects.order_by('-start_date')[:5]
@@ -84,16 +108,45 @@ def dashboard_view(request):
 # Voters
 # ─────────────────────────────────────────────
 
+def _apply_search(queryset, q, text_fields=(), id_fields=()):
+    """Filter `queryset` on the search term `q` across the given fields.
+
+    Identifier columns get anchored prefix matches that can walk their
+    indexes; text columns fall back to substring match. Digit-only
+    terms are treated as identifier lookups when identifier fields are
+    available. On Postgres a materialized tsvector with a GIN index
+    would replace the text LIKEs, but SQLite has no equivalent.
+    """
+    if not q:
+        return queryset
+    condition = Q()
+    if q.isdigit() or not text_fields:
+        for field in id_fields:
+            condition |= Q(**{f'{field}__startswith': q})
+    if not condition:
+        for field in text_fields:
+            condition |= Q(**{f'{field}__icontains': q})
+    return queryset.filter(condition)
+
+
 @admin_required
 def voter_list(request):
     q = request.GET.get('q', '').strip()
     filter_verified = request.GET.get('verified', '')
     filter_voted = request.GET.get('voted', '')
 
-    voters = Voter.objects.select_related('state', 'constituency').order_by('-created_at')
-
-    if q:
-        voters = voters.filter(Q(name__icontains=q) | Q(aadhaar_number__icontains=q) | Q(mobile_number__icontains=q))
+    # Only the rendered columns; notably skips the face_encoding blob
+    # and face_image/address text on every row
+    voters = Voter.objects.select_related('state', 'constituency').only(
+        'id', 'name', 'aadhaar_number', 'mobile_number', 'is_verified',
+        'has_voted', 'created_at', 'state__name', 'constituency__name',
+    )
+
+    voters = _apply_search(
+        voters, q,
+        text_fields=('name', 'mobile_number'),
+        id_fields=('aadhaar_number', 'mobile_number'),
+    )
     if filter_verified == '1':
         voters = voters.filter(is_verified=True)
     elif filter_verified == '0':
@@ -103,19 +156,64 @@ def voter_list(request):
     elif filter_voted == '0':
         voters = voters.filter(has_voted=False)
 
-    paginator = Paginator(voters, 20)
-    page = request.GET.get('page', 1)
-    voters_page = paginator.get_page(page)
+    voters_page = keyset_paginate(voters, ['-created_at'], request.GET.get('cursor'), 20)
+    # Filtered totals stay fresh for 30s, so paging through a filtered
+    # list reuses one count instead of re-counting per page
+    filtered = bool(q or filter_verified or filter_voted)
+    total = approximate_count(
+        voters, cache_key='pa:count:voters',
+        vary_on=(q, filter_verified, filter_voted),
+        ttl=30 if filtered else 300,
+    )
 
     return render(request, 'platformadmindashboard/voters/list.html', {
         'voters': voters_page,
+        'total': total,
         'q': q,
         'filter_verified': filter_verified,
         'filter_voted': filter_voted,
-        'total': paginator.count,
     })
 
 
+class _EchoBuffer:
+    """Pseudo-buffer whose write() returns the row for streaming CSV"""
+
+    def write(self, value):
+        return value
+
+
+@admin_required
+def voter_export(request):
+    """Stream the voter roll as CSV.
+
+    Rows are pulled with iterator(chunk_size=...) and written straight
+    into the response, so memory stays constant no matter how large the
+    table grows.
+    """
+    writer = csv.writer(_EchoBuffer())
+    voters = Voter.objects.select_related('state', 'constituency').only(
+        'aadhaar_number', 'name', 'mobile_number', 'is_verified',
+        'has_voted', 'created_at', 'state__name', 'constituency__name',
+    ).order_by('id')
+
+    def rows():
+        yield writer.writerow([
+            'aadhaar_number', 'name', 'mobile_number', 'state',
+            'constituency', 'is_verified', 'has_voted', 'created_at',
+        ])
+        for voter in voters.iterator(chunk_size=2000):
+            yield writer.writerow([
+                voter.aadhaar_number, voter.name, voter.mobile_number,
+                voter.state.name, voter.constituency.name,
+                voter.is_verified, voter.has_voted,
+                voter.created_at.isoformat(),
+            ])
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="voters.csv"'
+    return response
+
+
 @admin_required
 def voter_detail(request, voter_id):
     voter = get_object_or_404(Voter.objects.select_related('state', 'constituency'), id=voter_id)
@@ -130,8 +228,10 @@ def voter_detail(request, voter_id):
 
 @admin_required
 def voter_create(request):
-    states = State.objects.all()
-    constituencies = Constituency.objects.select_related('state').all()
+    # Constituencies load lazily via api_constituencies_by_state once a
+    # state is picked; the state options come from the signal-invalidated
+    # cache
+    states = get_states_cached()
     errors = {}
 
     if request.method == 'POST':
@@ -156,12 +256,11 @@ def voter_create(request):
                 messages.success(request, f'Voter "{voter.name}" created successfully.')
                 return redirect('platformadmin:voter_list')
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/voters/form.html', {
         'action': 'Create',
         'states': states,
-        'constituencies': constituencies,
         'errors': errors,
         'data': request.POST,
     })
@@ -170,8 +269,10 @@ def voter_create(request):
 @admin_required
 def voter_edit(request, voter_id):
     voter = get_object_or_404(Voter, id=voter_id)
-    states = State.objects.all()
-    constituencies = Constituency.objects.select_related('state').all()
+    # Constituencies load lazily via api_constituencies_by_state once a
+    # state is picked; the state options come from the signal-invalidated
+    # cache
+    states = get_states_cached()
     errors = {}
 
     if request.method == 'POST':
@@ -187,19 +288,26 @@ def voter_edit(request, voter_id):
                 voter.constituency_id = data['constituency']
                 voter.address = data['address']
                 voter.is_verified = bool(data.get('is_verified'))
+                # Write only the edited columns; notably leaves the
+                # face_encoding blob untouched
+                update_fields = [
+                    'name', 'date_of_birth', 'mobile_number', 'email',
+                    'state', 'constituency', 'address', 'is_verified',
+                    'updated_at',
+                ]
                 if 'face_image' in request.FILES:
                     voter.face_image = request.FILES['face_image']
-                voter.save()
+                    update_fields.append('face_image')
+                voter.save(update_fields=update_fields)
                 messages.success(request, f'Voter "{voter.name}" updated successfully.')
                 return redirect('platformadmin:voter_detail', voter_id=voter.id)
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/voters/form.html', {
         'action': 'Edit',
         'voter': voter,
         'states': states,
-        'constituencies': constituencies,
         'errors': errors,
         'data': request.POST or {
             'name': voter.name,
@@ -224,22 +332,35 @@ def voter_delete(request, voter_id):
     return redirect('platformadmin:voter_list')
 
 
+def _require(data, fields):
+    """Presence check shared by the form validators."""
+    return {
+        field: f'{field.replace("_", " ").title()} is required.'
+        for field in fields
+        if not data.get(field)
+    }
+
+
 def _validate_voter_form(data, edit=False):
-    errors = {}
-    if not data.get('name'):
-        errors['name'] = 'Name is required.'
-    if not data.get('date_of_birth'):
-        errors['date_of_birth'] = 'Date of birth is required.'
-    if not data.get('mobile_number'):
-        errors['mobile_number'] = 'Mobile number is required.'
-    if not data.get('state'):
-        errors['state'] = 'State is required.'
-    if not data.get('constituency'):
-        errors['constituency'] = 'Constituency is required.'
-    if not data.get('address'):
-        errors['address'] = 'Address is required.'
-    if not edit and not data.get('aadhaar_number'):
-        errors['aadhaar_number'] = 'Aadhaar number is required.'
+    fields = ['name', 'date_of_birth', 'mobile_number', 'state', 'constituency', 'address']
+    if not edit:
+        fields.append('aadhaar_number')
+    errors = _require(data, fields)
+    if not edit and 'aadhaar_number' not in errors and not data['aadhaar_number'].isdigit():
+        # Stored as an integer column, so non-digits can't be saved
+        errors['aadhaar_number'] = 'Aadhaar number must be 12 digits.'
+    if 'state' not in errors and 'constituency' not in errors:
+        # One indexed exists() confirms both foreign keys and that the
+        # constituency belongs to the chosen state, instead of letting
+        # save() fail with an IntegrityError and a rollback
+        try:
+            valid = Constituency.objects.filter(
+                id=data['constituency'], state_id=data['state']
+            ).exists()
+        except (ValueError, TypeError):
+            valid = False
+        if not valid:
+            errors['constituency'] = 'Constituency does not match the selected state.'
     return errors
 
 
@@ -252,22 +373,27 @@ def election_list(request):
     q = request.GET.get('q', '').strip()
     status_filter = request.GET.get('status', '')
 
-    elections = Election.objects.annotate(vote_count=Count('votes'), candidate_count=Count('candidates'))
+    # Independent correlated subqueries: two Counts through different
+    # joins in one annotate multiply each other's rows and force
+    # DISTINCT; a subquery per count keeps one row per election
+    vote_sq = Vote.objects.filter(election=OuterRef('pk')).values('election').annotate(c=Count('pk')).values('c')
+    cand_sq = Candidate.objects.filter(election=OuterRef('pk')).values('election').annotate(c=Count('pk')).values('c')
+    elections = Election.objects.annotate(
+        vote_count=Coalesce(Subquery(vote_sq), 0),
+        candidate_count=Coalesce(Subquery(cand_sq), 0),
+    )
 
     if q:
         elections = elections.filter(Q(title__icontains=q) | Q(description__icontains=q))
     if status_filter:
         elections = elections.filter(status=status_filter)
 
-    elections = elections.order_by('-start_date')
-    paginator = Paginator(elections, 15)
-    page_obj = paginator.get_page(request.GET.get('page', 1))
+    page_obj = keyset_paginate(elections, ['-start_date'], request.GET.get('cursor'), 15)
 
     return render(request, 'platformadmindashboard/elections/list.html', {
         'elections': page_obj,
         'q': q,
         'status_filter': status_filter,
-        'total': paginator.count,
         'status_choices': Election.STATUS_CHOICES,
     })
 
@@ -290,7 +416,7 @@ def election_create(request):
                 messages.success(request, 'Election created successfully.')
                 return redirect('platformadmin:election_list')
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/elections/form.html', {
         'action': 'Create',
@@ -316,11 +442,14 @@ def election_edit(request, election_id):
                 election.status = request.POST['status']
                 election.start_date = request.POST['start_date']
                 election.end_date = request.POST['end_date']
-                election.save()
+                election.save(update_fields=[
+                    'title', 'description', 'election_type', 'status',
+                    'start_date', 'end_date', 'updated_at',
+                ])
                 messages.success(request, 'Election updated successfully.')
                 return redirect('platformadmin:election_list')
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/elections/form.html', {
         'action': 'Edit',
@@ -350,11 +479,7 @@ def election_delete(request, election_id):
 
 
 def _validate_election_form(data):
-    errors = {}
-    for field in ['title', 'description', 'election_type', 'status', 'start_date', 'end_date']:
-        if not data.get(field):
-            errors[field] = f'{field.replace("_", " ").title()} is required.'
-    return errors
+    return _require(data, ['title', 'description', 'election_type', 'status', 'start_date', 'end_date'])
 
 
 # ─────────────────────────────────────────────
@@ -366,23 +491,24 @@ def candidate_list(request):
     q = request.GET.get('q', '').strip()
     election_filter = request.GET.get('election', '')
 
-    candidates = Candidate.objects.select_related('election', 'constituency').annotate(vote_count=Count('votes'))
+    candidates = Candidate.objects.select_related('election', 'constituency').only(
+        'id', 'name', 'party_name', 'photo', 'election__title', 'constituency__name',
+    ).annotate(vote_count=Count('votes'))
 
-    if q:
-        candidates = candidates.filter(Q(name__icontains=q) | Q(party_name__icontains=q))
+    candidates = _apply_search(candidates, q, text_fields=('name', 'party_name'))
     if election_filter:
         candidates = candidates.filter(election_id=election_filter)
 
-    candidates = candidates.order_by('election', 'name')
-    paginator = Paginator(candidates, 20)
-    page_obj = paginator.get_page(request.GET.get('page', 1))
+    # election_id, not 'election': ordering by the FK name would pull in
+    # Election.Meta.ordering (-start_date) while the cursor compares ids
+    # ascending, and the two disagreeing drops rows between pages
+    page_obj = keyset_paginate(candidates, ['election_id', 'name'], request.GET.get('cursor'), 20)
 
     return render(request, 'platformadmindashboard/candidates/list.html', {
         'candidates': page_obj,
         'q': q,
         'election_filter': election_filter,
-        'elections': Election.objects.all().order_by('-start_date'),
-        'total': paginator.count,
+        'elections': get_elections_cached(),
     })
 
 
@@ -408,12 +534,12 @@ def candidate_create(request):
                 messages.success(request, f'Candidate "{candidate.name}" added successfully.')
                 return redirect('platformadmin:candidate_list')
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/candidates/form.html', {
         'action': 'Create',
-        'elections': Election.objects.all().order_by('-start_date'),
-        'constituencies': Constituency.objects.select_related('state').all(),
+        'elections': get_elections_cached(),
+        'constituencies': Constituency.objects.select_related('state').only('id', 'name', 'state__code'),
         'errors': errors,
         'data': request.POST,
     })
@@ -433,21 +559,24 @@ def candidate_edit(request, candidate_id):
                 candidate.election_id = request.POST['election']
                 candidate.constituency_id = request.POST['constituency']
                 candidate.manifesto = request.POST.get('manifesto', '')
+                update_fields = ['name', 'party_name', 'election', 'constituency', 'manifesto']
                 if 'photo' in request.FILES:
                     candidate.photo = request.FILES['photo']
+                    update_fields.append('photo')
                 if 'party_symbol' in request.FILES:
                     candidate.party_symbol = request.FILES['party_symbol']
-                candidate.save()
+                    update_fields.append('party_symbol')
+                candidate.save(update_fields=update_fields)
                 messages.success(request, f'Candidate "{candidate.name}" updated successfully.')
                 return redirect('platformadmin:candidate_list')
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/candidates/form.html', {
         'action': 'Edit',
         'candidate': candidate,
-        'elections': Election.objects.all().order_by('-start_date'),
-        'constituencies': Constituency.objects.select_related('state').all(),
+        'elections': get_elections_cached(),
+        'constituencies': Constituency.objects.select_related('state').only('id', 'name', 'state__code'),
         'errors': errors,
         'data': request.POST or {
             'name': candidate.name,
@@ -470,10 +599,19 @@ def candidate_delete(request, candidate_id):
 
 
 def _validate_candidate_form(data):
-    errors = {}
-    for field in ['name', 'party_name', 'election', 'constituency']:
-        if not data.get(field):
-            errors[field] = f'{field.replace("_", " ").title()} is required.'
+    errors = _require(data, ['name', 'party_name', 'election', 'constituency'])
+    if 'election' not in errors:
+        # The cached option list already holds every valid election id
+        known = {str(option['id']) for option in get_elections_cached()}
+        if data['election'] not in known:
+            errors['election'] = 'Select a valid election.'
+    if 'constituency' not in errors:
+        try:
+            valid = Constituency.objects.filter(id=data['constituency']).exists()
+        except (ValueError, TypeError):
+            valid = False
+        if not valid:
+            errors['constituency'] = 'Select a valid constituency.'
     return errors
 
 
@@ -486,23 +624,38 @@ def vote_list(request):
     q = request.GET.get('q', '').strip()
     election_filter = request.GET.get('election', '')
 
-    votes = Vote.objects.select_related('voter', 'election', 'candidate')
-
-    if q:
-        votes = votes.filter(Q(voter__aadhaar_number__icontains=q) | Q(blockchain_hash__icontains=q))
+    # Voter rows are unique per vote, so that join stays select_related;
+    # election and candidate rows repeat across a page (one election is
+    # usually active), so they are prefetched and deduplicated instead
+    # of being rejoined into every row
+    # election/candidate stay in only(): dropping the FK columns would
+    # make the prefetch (and the template) load them back row by row
+    votes = Vote.objects.select_related('voter').only(
+        'id', 'blockchain_hash', 'cast_at', 'election', 'candidate',
+        'voter__aadhaar_number',
+    ).prefetch_related(
+        Prefetch('election', queryset=Election.objects.only('id', 'title')),
+        Prefetch('candidate', queryset=Candidate.objects.only('id', 'name')),
+    )
+
+    votes = _apply_search(votes, q, id_fields=('voter__aadhaar_number', 'blockchain_hash'))
     if election_filter:
         votes = votes.filter(election_id=election_filter)
 
-    votes = votes.order_by('-cast_at')
-    paginator = Paginator(votes, 25)
-    page_obj = paginator.get_page(request.GET.get('page', 1))
+    page_obj = keyset_paginate(votes, ['-cast_at'], request.GET.get('cursor'), 25)
+    filtered = bool(q or election_filter)
+    total = approximate_count(
+        votes, cache_key='pa:count:votes',
+        vary_on=(q, election_filter),
+        ttl=30 if filtered else 300,
+    )
 
     return render(request, 'platformadmindashboard/votes/list.html', {
         'votes': page_obj,
+        'total': total,
         'q': q,
         'election_filter': election_filter,
-        'elections': Election.objects.all().order_by('-start_date'),
-        'total': paginator.count,
+        'elections': get_elections_cached(),
     })
 
 
@@ -536,7 +689,7 @@ def admin_user_create(request):
                 messages.success(request, f'Admin "{admin.username}" created successfully.')
                 return redirect('platformadmin:admin_user_list')
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/admins/form.html', {
         'action': 'Create',
@@ -564,13 +717,15 @@ def admin_user_edit(request, admin_id):
                 admin.email = data['email']
                 admin.role = data.get('role', admin.role)
                 admin.status = data.get('status', admin.status)
+                update_fields = ['full_name', 'email', 'role', 'status']
                 if data.get('password'):
                     admin.set_password(data['password'])
-                admin.save()
+                    update_fields.append('password_hash')
+                admin.save(update_fields=update_fields)
                 messages.success(request, 'Admin account updated.')
                 return redirect('platformadmin:admin_user_list')
             except Exception as e:
-                errors['__all__'] = str(e)
+                errors['general'] = str(e)
 
     return render(request, 'platformadmindashboard/admins/form.html', {
         'action': 'Edit',
@@ -601,11 +756,7 @@ def admin_user_delete(request, admin_id):
 
 
 def _validate_admin_form(data):
-    errors = {}
-    for field in ['username', 'full_name', 'email', 'password']:
-        if not data.get(field):
-            errors[field] = f'{field.replace("_", " ").title()} is required.'
-    return errors
+    return _require(data, ['username', 'full_name', 'email', 'password'])
 
 
 # ─────────────────────────────────────────────
@@ -614,5 +765,8 @@ def _validate_admin_form(data):
 
 @admin_required
 def api_constituencies_by_state(request, state_id):
-    constituencies = list(Constituency.objects.filter(state_id=state_id).values('id', 'name', 'constituency_code'))
-    return JsonResponse({'constituencies': constituencies})
+    constituencies = get_constituencies_cached(state_id)
+    response = JsonResponse({'constituencies': constituencies})
+    # Let browsers reuse the list across dropdown changes too
+    response['Cache-Control'] = 'private, max-age=600'
+    return response
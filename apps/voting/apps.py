@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class VotingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'voting'
+
+    def ready(self):
+        # Drop the cached live-election list when elections change
+        from django.db.models.signals import post_save, post_delete
+        from .caching import invalidate_live_elections
+        from .models import Election
+        for signal in (post_save, post_delete):
+            signal.connect(invalidate_live_elections, sender=Election)
@@ -0,0 +1,98 @@
+"""
+Write-behind queue for blockchain vote recording.
+
+api_cast_vote returns as soon as the Vote row commits; the mining — the
+slow part of a cast — happens here, on a daemon thread that drains a
+process-local queue and backfills blockchain_hash / transaction_hash on
+the row. A Celery or RQ worker would be the cross-process version of
+the same split, but this tree runs the blockchain in-process, so the
+queue lives in-process too.
+"""
+
+import logging
+import queue
+import threading
+
+from django.db import close_old_connections
+
+from blockchain.blockchain_service import blockchain_service
+
+logger = logging.getLogger(__name__)
+
+_queue = queue.Queue()
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def enqueue_vote(vote_id):
+    """Hand a pending Vote to the worker; returns immediately"""
+    _ensure_worker()
+    _queue.put(vote_id)
+
+
+def flush():
+    """Block until every queued vote has been recorded (used by tests
+    and one-off scripts; requests never call this)"""
+    _queue.join()
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_drain, name='blockchain-writer', daemon=True
+            )
+            _worker.start()
+
+
+def _drain():
+    while True:
+        vote_id = _queue.get()
+        try:
+            _record(vote_id)
+        except Exception:
+            logger.exception('Blockchain recording failed for vote %s', vote_id)
+            _mark_failed(vote_id)
+        finally:
+            _queue.task_done()
+
+
+def _record(vote_id):
+    from .models import Vote
+
+    # The worker thread owns its own DB connection; recycle stale ones
+    # the same way request handling does
+    close_old_connections()
+
+    vote = (
+        Vote.objects.select_related('voter')
+        .defer('voter__face_encoding')
+        .get(id=vote_id)
+    )
+    # aadhaar_display, not the raw int: the voter hash is built from the
+    # 12-digit written form the chain has always used
+    result = blockchain_service.cast_vote_to_blockchain(
+        voter_id=vote.voter.aadhaar_display,
+        election_id=vote.election_id,
+        candidate_id=vote.candidate_id,
+    )
+    if result['success']:
+        Vote.objects.filter(pk=vote_id).update(
+            blockchain_hash=result['block_hash'],
+            transaction_hash=result['transaction_hash'],
+            blockchain_status='confirmed',
+        )
+    else:
+        Vote.objects.filter(pk=vote_id).update(blockchain_status='failed')
+
+
+def _mark_failed(vote_id):
+    from .models import Vote
+
+    try:
+        Vote.objects.filter(pk=vote_id).update(blockchain_status='failed')
+    except Exception:
+        logger.exception('Could not mark vote %s as failed', vote_id)
@@ -0,0 +1,43 @@
+"""Cached live-election lookups for the voter-facing pages.
+
+Every landing-page and dashboard render queried the live elections
+even though they change on the order of minutes. The lists are cached
+for a short TTL; the global list is also dropped from an Election
+save/delete signal, while the per-constituency entries simply age out
+(at most 60 seconds of staleness, and a cache backend with pattern
+deletes is not a dependency here).
+"""
+
+from django.core.cache import cache
+
+from .models import Election
+
+LIVE_ELECTIONS_KEY = 'voting:live-elections'
+LIVE_ELECTIONS_TTL = 60
+
+
+def get_live_elections():
+    """All live elections, for the landing page"""
+    return cache.get_or_set(
+        LIVE_ELECTIONS_KEY,
+        lambda: list(Election.objects.filter(status='live')),
+        LIVE_ELECTIONS_TTL,
+    )
+
+
+def get_live_elections_for_constituency(constituency_id):
+    """Live elections with a candidate in the given constituency"""
+    return cache.get_or_set(
+        f'{LIVE_ELECTIONS_KEY}:const:{constituency_id}',
+        lambda: list(
+            Election.objects.filter(
+                status='live',
+                candidates__constituency_id=constituency_id,
+            ).distinct()
+        ),
+        LIVE_ELECTIONS_TTL,
+    )
+
+
+def invalidate_live_elections(sender, **kwargs):
+    cache.delete(LIVE_ELECTIONS_KEY)
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from voting.models import State, Constituency, Election, Candidate, Voter
@@ -7,10 +8,22 @@ from voting.models import State, Constituency, Election, Candidate, Voter
 class Command(BaseCommand):
     help = 'Populate database with sample data for testing'
 
+    # bulk_create already lands rows in multi-row INSERTs with none of
+    # the per-instance save()/signal machinery; 500 rows per statement
+    # keeps the round trips low as the sample data grows. On a Postgres
+    # deployment the next rung up would be COPY FROM STDIN via
+    # cursor.copy_expert — SQLite has no equivalent, so the batched
+    # INSERT is the fastest path this backend offers.
+    BATCH_SIZE = 500
+
+    # One transaction for the whole populate run: a single commit/fsync
+    # instead of one per insert, and a partial run leaves nothing behind
+    @transaction.atomic
     def handle(self, *args, **kwargs):
         self.stdout.write('Populating database with sample data...')
-        
-        # Create States
+
+        # Create States: one SELECT for existing codes, one batched
+        # INSERT for the rest, instead of two queries per row
         states_data = [
             {'name': 'Maharashtra', 'code': 'MH'},
             {'name': 'Karnataka', 'code': 'KA'},
@@ -18,14 +31,15 @@ class Command(BaseCommand):
             {'name': 'Gujarat', 'code': 'GJ'},
             {'name': 'Delhi', 'code': 'DL'},
         ]
-        
-        states = {}
-        for state_data in states_data:
-            state, created = State.objects.get_or_create(**state_data)
-            states[state.code] = state
-            if created:
-                self.stdout.write(f'Created state: {state.name}')
-        
+
+        existing_codes = set(State.objects.values_list('code', flat=True))
+        new_states = [State(**d) for d in states_data if d['code'] not in existing_codes]
+        State.objects.bulk_create(new_states, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+        for state in new_states:
+            self.stdout.write(f'Created state: {state.name}')
+        # Refetch so every row has a pk regardless of who inserted it
+        states = {s.code: s for s in State.objects.all()}
+
         # Create Constituencies
         constituencies_data = [
             {'name': 'Mumbai North', 'state': states['MH'], 'constituency_code': 'MH01'},
@@ -37,15 +51,20 @@ class Command(BaseCommand):
             {'name': 'Ahmedabad East', 'state': states['GJ'], 'constituency_code': 'GJ01'},
             {'name': 'New Delhi', 'state': states['DL'], 'constituency_code': 'DL01'},
         ]
-        
-        constituencies = {}
-        for const_data in constituencies_data:
-            const, created = Constituency.objects.get_or_create(**const_data)
-            constituencies[const.constituency_code] = const
-            if created:
-                self.stdout.write(f'Created constituency: {const.name}')
-        
-        # Create Elections
+
+        existing_const = set(Constituency.objects.values_list('constituency_code', flat=True))
+        new_constituencies = [
+            Constituency(**d) for d in constituencies_data
+            if d['constituency_code'] not in existing_const
+        ]
+        Constituency.objects.bulk_create(new_constituencies, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+        for const in new_constituencies:
+            self.stdout.write(f'Created constituency: {const.name}')
+        constituencies = {c.constituency_code: c for c in Constituency.objects.all()}
+
+        # Create Elections — kept on get_or_create: Election has no
+        # unique key for ignore_conflicts to deduplicate on, and the
+        # defaults matter
         now = timezone.now()
         elections_data = [
             {
@@ -65,7 +84,7 @@ class Command(BaseCommand):
                 'end_date': now + timedelta(days=37),
             },
         ]
-        
+
         elections = []
         for elec_data in elections_data:
             elec, created = Election.objects.get_or_create(
@@ -75,7 +94,7 @@ class Command(BaseCommand):
             elections.append(elec)
             if created:
                 self.stdout.write(f'Created election: {elec.title}')
-        
+
         # Create Candidates for General Election
         general_election = elections[0]
         candidates_data = [
@@ -83,30 +102,37 @@ class Command(BaseCommand):
             {'name': 'Rajesh Kumar', 'party_name': 'Indian National Congress', 'constituency': constituencies['MH01']},
             {'name': 'Priya Sharma', 'party_name': 'Bharatiya Janata Party', 'constituency': constituencies['MH01']},
             {'name': 'Amit Patel', 'party_name': 'Aam Aadmi Party', 'constituency': constituencies['MH01']},
-            
+
             # Mumbai South
             {'name': 'Sunita Desai', 'party_name': 'Indian National Congress', 'constituency': constituencies['MH02']},
             {'name': 'Vikram Singh', 'party_name': 'Bharatiya Janata Party', 'constituency': constituencies['MH02']},
-            
+
             # Bangalore North
             {'name': 'Ramesh Rao', 'party_name': 'Indian National Congress', 'constituency': constituencies['KA01']},
             {'name': 'Lakshmi Iyer', 'party_name': 'Bharatiya Janata Party', 'constituency': constituencies['KA01']},
-            
+
             # Delhi
             {'name': 'Arvind Kejriwal', 'party_name': 'Aam Aadmi Party', 'constituency': constituencies['DL01']},
             {'name': 'Manoj Tiwari', 'party_name': 'Bharatiya Janata Party', 'constituency': constituencies['DL01']},
         ]
-        
-        for cand_data in candidates_data:
-            cand_data['election'] = general_election
-            cand, created = Candidate.objects.get_or_create(**cand_data)
-            if created:
-                self.stdout.write(f'Created candidate: {cand.name} ({cand.constituency.name})')
-        
+
+        # Existing candidates by the unique_together key
+        existing_cands = set(
+            Candidate.objects.filter(election=general_election)
+            .values_list('election_id', 'constituency_id', 'name')
+        )
+        new_candidates = [
+            Candidate(election=general_election, **d) for d in candidates_data
+            if (general_election.id, d['constituency'].id, d['name']) not in existing_cands
+        ]
+        Candidate.objects.bulk_create(new_candidates, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+        for cand in new_candidates:
+            self.stdout.write(f'Created candidate: {cand.name} ({cand.constituency.name})')
+
         # Create sample voters
         voters_data = [
             {
-                'aadhaar_number': '123456789012',
+                'aadhaar_number': 123456789012,
                 'name': 'Test Voter 1',
                 'date_of_birth': '1990-01-01',
                 'mobile_number': '9876543210',
@@ -117,7 +143,7 @@ class Command(BaseCommand):
                 'is_verified': True,
             },
             {
-                'aadhaar_number': '123456789013',
+                'aadhaar_number': 123456789013,
                 'name': 'Test Voter 2',
                 'date_of_birth': '1985-05-15',
                 'mobile_number': '9876543211',
@@ -128,13 +154,18 @@ class Command(BaseCommand):
                 'is_verified': True,
             },
         ]
-        
-        for voter_data in voters_data:
-            voter, created = Voter.objects.get_or_create(
-                aadhaar_number=voter_data['aadhaar_number'],
-                defaults=voter_data
-            )
-            if created:
-                self.stdout.write(f'Created voter: {voter.name}')
-        
+
+        existing_aadhaar = set(
+            Voter.objects.filter(
+                aadhaar_number__in=[d['aadhaar_number'] for d in voters_data]
+            ).values_list('aadhaar_number', flat=True)
+        )
+        new_voters = [
+            Voter(**d) for d in voters_data
+            if d['aadhaar_number'] not in existing_aadhaar
+        ]
+        Voter.objects.bulk_create(new_voters, batch_size=self.BATCH_SIZE, ignore_conflicts=True)
+        for voter in new_voters:
+            self.stdout.write(f'Created voter: {voter.name}')
+
         self.stdout.write(self.style.SUCCESS('Successfully populated database!'))
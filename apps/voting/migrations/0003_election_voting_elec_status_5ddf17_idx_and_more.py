@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-08-28 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0002_delete_admin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='election',
+            index=models.Index(fields=['status', '-start_date'], name='voting_elec_status_5ddf17_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['election', '-cast_at'], name='voting_vote_electio_5a8c8f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['is_verified', 'has_voted', '-created_at'], name='voting_vote_is_veri_37e117_idx'),
+        ),
+    ]
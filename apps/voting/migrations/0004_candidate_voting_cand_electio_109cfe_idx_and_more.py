@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-08-28 01:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0003_election_voting_elec_status_5ddf17_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['election', 'constituency'], name='voting_cand_electio_109cfe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['election', 'candidate'], name='voting_vote_electio_05e886_idx'),
+        ),
+    ]
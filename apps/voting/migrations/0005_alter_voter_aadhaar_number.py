@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-08-28 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0004_candidate_voting_cand_electio_109cfe_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='voter',
+            name='aadhaar_number',
+            field=models.BigIntegerField(db_index=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-08-28 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0005_alter_voter_aadhaar_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='blockchain_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('failed', 'Failed')], default='confirmed', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='blockchain_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=66, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='transaction_hash',
+            field=models.CharField(blank=True, max_length=66, null=True, unique=True),
+        ),
+    ]
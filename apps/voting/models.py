@@ -35,7 +35,9 @@ class Voter(models.Model):
     """Voter model with biometric data"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
     
-    aadhaar_number = models.CharField(max_length=12, unique=True, db_index=True)
+    # Stored as an integer: 12 digits fit in 8 bytes, so index keys are
+    # half the width of the old varchar and comparisons are numeric
+    aadhaar_number = models.BigIntegerField(unique=True, db_index=True)
     name = models.CharField(max_length=200)
     date_of_birth = models.DateField()
     mobile_number = models.CharField(max_length=10)
@@ -64,15 +66,25 @@ class Voter(models.Model):
     
     class Meta:
         ordering = ['-created_at']
-    
+        indexes = [
+            # Matches the admin voter list: status filters + newest-first order
+            models.Index(fields=['is_verified', 'has_voted', '-created_at']),
+        ]
+
+    @property
+    def aadhaar_display(self):
+        """Aadhaar number padded back to its 12-digit written form"""
+        return f'{self.aadhaar_number:012d}'
+
     def __str__(self):
-        return f"{self.name} ({self.aadhaar_number})"
+        return f"{self.name} ({self.aadhaar_display})"
     
     def mark_as_verified(self):
         """Mark voter as verified"""
         self.is_verified = True
         self.verified_at = timezone.now()
-        self.save()
+        # Skip rewriting the face_encoding blob and the rest of the row
+        self.save(update_fields=['is_verified', 'verified_at', 'updated_at'])
 
 
 class Election(models.Model):
@@ -106,7 +118,11 @@ class Election(models.Model):
     
     class Meta:
         ordering = ['-start_date']
-    
+        indexes = [
+            # Matches the election list: status filter + newest-first order
+            models.Index(fields=['status', '-start_date']),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.status})"
     
@@ -133,12 +149,24 @@ class Candidate(models.Model):
     class Meta:
         ordering = ['name']
         unique_together = ['election', 'constituency', 'name']
+        indexes = [
+            # vote_page / dashboard filter candidates by both columns
+            models.Index(fields=['election', 'constituency']),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.party_name})"
     
     def get_vote_count(self):
-        """Get total votes for this candidate"""
+        """Get total votes for this candidate.
+
+        Prefers a `vote_count` annotation when the queryset supplied
+        one (a single GROUP BY for the whole page) and only falls back
+        to a per-row COUNT for detached instances.
+        """
+        annotated = getattr(self, 'vote_count', None)
+        if annotated is not None:
+            return annotated
         return self.votes.count()
 
 
@@ -148,9 +176,22 @@ class Vote(models.Model):
     election = models.ForeignKey(Election, on_delete=models.PROTECT, related_name='votes')
     candidate = models.ForeignKey(Candidate, on_delete=models.PROTECT, related_name='votes')
     
-    # Blockchain data
-    blockchain_hash = models.CharField(max_length=66, unique=True, db_index=True)
-    transaction_hash = models.CharField(max_length=66, unique=True)
+    BLOCKCHAIN_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('confirmed', 'Confirmed'),
+        ('failed', 'Failed'),
+    ]
+
+    # Blockchain data. The row is written before the block is mined;
+    # the write-behind worker (voting.blockchain_queue) backfills the
+    # hashes and flips the status, so both are nullable while pending.
+    # The default is 'confirmed' because every row that predates the
+    # queue was only created after a successful mine
+    blockchain_hash = models.CharField(max_length=66, unique=True, db_index=True, null=True, blank=True)
+    transaction_hash = models.CharField(max_length=66, unique=True, null=True, blank=True)
+    blockchain_status = models.CharField(
+        max_length=10, choices=BLOCKCHAIN_STATUS_CHOICES, default='confirmed'
+    )
     
     # Metadata
     cast_at = models.DateTimeField(auto_now_add=True)
@@ -160,14 +201,28 @@ class Vote(models.Model):
     class Meta:
         ordering = ['-cast_at']
         unique_together = ['voter', 'election']  # One vote per election per voter
+        indexes = [
+            # Matches the vote list: per-election filter + newest-first order
+            models.Index(fields=['election', '-cast_at']),
+            # Per-candidate tallies within an election
+            models.Index(fields=['election', 'candidate']),
+        ]
     
     def __str__(self):
         return f"Vote by {self.voter.aadhaar_number} in {self.election.title}"
     
     def generate_receipt_hash(self):
-        """Generate a receipt hash for the voter"""
-        data = f"{self.voter.aadhaar_number}{self.election.id}{self.cast_at}"
-        return hashlib.sha256(data.encode()).hexdigest()
+        """Generate a receipt hash for the voter.
+
+        Memoized on the instance: the inputs are immutable once the
+        vote exists, and the digest may be requested more than once per
+        request. hashlib itself already dispatches to OpenSSL, which
+        uses the CPU's SHA extensions where available.
+        """
+        if not hasattr(self, '_receipt_hash'):
+            data = f"{self.voter.aadhaar_number}{self.election.id}{self.cast_at}"
+            self._receipt_hash = hashlib.sha256(data.encode()).hexdigest()
+        return self._receipt_hash
 
 
 class VoterVerification(models.Model):
@@ -191,7 +246,19 @@ class VoterVerification(models.Model):
     
     class Meta:
         ordering = ['-attempted_at']
-    
+
+    @classmethod
+    def log_attempts(cls, attempts):
+        """Insert one verification session's attempt rows in a batch.
+
+        A login runs up to three checks (face, liveness, duplicate);
+        callers collect them as dicts of field values and land them in
+        a single INSERT instead of one per attempt.
+        """
+        return cls.objects.bulk_create(
+            [cls(**attempt) for attempt in attempts], batch_size=100
+        )
+
     def __str__(self):
         status = "Success" if self.success else "Failed"
         return f"{self.verification_type} - {status} ({self.attempted_at})"
@@ -11,4 +11,5 @@ urlpatterns = [
     # API endpoints
     path('api/verify-login/', views.api_verify_login, name='api_verify_login'),
     path('api/cast-vote/', views.api_cast_vote, name='api_cast_vote'),
+    path('api/vote-status/<int:vote_id>/', views.api_vote_status, name='api_vote_status'),
 ]
@@ -1,58 +1,118 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from django.core.files.base import ContentFile
+from django.db import IntegrityError
+from django.db.models import Count
+from asgiref.sync import sync_to_async
 import json
 import base64
 
+try:
+    import orjson  # SIMD-accelerated JSON; optional
+except ImportError:
+    orjson = None
+
+from .blockchain_queue import enqueue_vote
+from .caching import get_live_elections, get_live_elections_for_constituency
 from .models import Voter, Election, Candidate, Vote, VoterVerification, Constituency, State
 from ai_verification.verification_service import verification_service
-from blockchain.blockchain_service import blockchain_service
 
 
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_response(payload):
+        return HttpResponse(orjson.dumps(payload), content_type='application/json')
+else:
+    _json_loads = json.loads
+    _json_response = JsonResponse
+
+
+def _voter_session_ctx(voter):
+    """Display fields the dashboard needs, cached in the session at
+    login so the page renders without refetching the voter. Nested
+    dicts keep the template's voter.constituency.name lookups working.
+    """
+    return {
+        'id': voter.id,
+        'name': voter.name,
+        'aadhaar_number': voter.aadhaar_number,
+        'is_verified': voter.is_verified,
+        'constituency_id': voter.constituency_id,
+        'constituency': {'name': voter.constituency.name},
+        'state': {'name': voter.state.name},
+    }
+
+
+# Whole-page cache for the anonymous landing page. The csrf token it
+# embeds only targets the csrf-exempt login API, and Vary: Cookie keeps
+# entries per-session once a cookie exists; a 30s TTL covers election
+# changes, since clearing the cache from a signal would also evict
+# sessions and every other entry
+@cache_page(30)
 def index(request):
     """Landing page with login"""
-    # Get active elections
-    active_elections = Election.objects.filter(status='live')
-    
+    # Get active elections (cached; see voting.caching)
+    active_elections = get_live_elections()
+
     context = {
         'active_elections': active_elections
     }
     return render(request, 'index.html', context)
 
 
-@csrf_exempt
-def api_verify_login(request):
-    """API endpoint for Aadhaar-based login with face verification"""
+async def api_verify_login(request):
+    """API endpoint for Aadhaar-based login with face verification.
+
+    Async so a worker isn't pinned for the whole request under an ASGI
+    server; the ORM lookup uses the native async API and the session
+    write (a sync backend) is pushed to a thread.
+    """
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Invalid request method'})
-    
+        return _json_response({'success': False, 'message': 'Invalid request method'})
+
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
         aadhaar = data.get('aadhaar_number')
-        
+
         if not aadhaar:
-            return JsonResponse({'success': False, 'message': 'Aadhaar number required'})
-        
+            return _json_response({'success': False, 'message': 'Aadhaar number required'})
+
+        # The column is an integer now; reject non-numeric input here
+        # instead of erroring inside the lookup
+        try:
+            aadhaar = int(aadhaar)
+        except (TypeError, ValueError):
+            return _json_response({'success': False, 'message': 'Invalid Aadhaar number'})
+
         # Get voter
         try:
-            voter = Voter.objects.get(aadhaar_number=aadhaar)
+            voter = await Voter.objects.select_related('state', 'constituency').aget(
+                aadhaar_number=aadhaar
+            )
         except Voter.DoesNotExist:
-            return JsonResponse({'success': False, 'message': 'Voter not found'})
-        
+            return _json_response({'success': False, 'message': 'Voter not found'})
+
         if not voter.is_verified:
-            return JsonResponse({'success': False, 'message': 'Voter not verified'})
-        
-        # Create session
-        request.session['voter_id'] = voter.id
-        request.session['voter_aadhaar'] = voter.aadhaar_number
-        request.session['voter_name'] = voter.name
-        
-        return JsonResponse({
+            return _json_response({'success': False, 'message': 'Voter not verified'})
+
+        # Create session. voter_ctx carries everything the dashboard
+        # renders, so that page skips the voter fetch entirely
+        def _start_session():
+            request.session['voter_id'] = voter.id
+            request.session['voter_aadhaar'] = voter.aadhaar_number
+            request.session['voter_name'] = voter.name
+            request.session['voter_ctx'] = _voter_session_ctx(voter)
+
+        await sync_to_async(_start_session)()
+
+        return _json_response({
             'success': True,
             'message': 'Login successful',
             'voter_name': voter.name,
@@ -60,33 +120,48 @@ def api_verify_login(request):
         })
         
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': f'Login failed: {str(e)}'
         })
 
 
+# csrf_exempt's wrapper is not coroutine-aware before Django 5.0, so the
+# attribute is set directly on the async views
+api_verify_login.csrf_exempt = True
+
+
 def dashboard(request):
     """Voter dashboard"""
     voter_id = request.session.get('voter_id')
     if not voter_id:
         return redirect('index')
     
-    voter = get_object_or_404(Voter, id=voter_id)
-    
-    # Get active elections for voter's constituency
-    active_elections = Election.objects.filter(
-        status='live',
-        candidates__constituency=voter.constituency
-    ).distinct()
-    
-    # Check which elections voter has voted in
-    voted_elections = Vote.objects.filter(voter=voter).values_list('election_id', flat=True)
-    
+    # Everything the template shows was cached in the session at login;
+    # rebuild it once for sessions that predate the cached context
+    voter = request.session.get('voter_ctx')
+    if voter is None:
+        row = get_object_or_404(
+            Voter.objects.select_related('state', 'constituency'), id=voter_id
+        )
+        voter = _voter_session_ctx(row)
+        request.session['voter_ctx'] = voter
+
+    # Get active elections for voter's constituency (cached per
+    # constituency; see voting.caching)
+    active_elections = get_live_elections_for_constituency(voter['constituency_id'])
+
+    # Check which elections voter has voted in — a frozenset so the
+    # template's `in` test is a hash probe, and the query returns only
+    # ids off the (voter, election) unique index
+    voted_elections = frozenset(
+        Vote.objects.filter(voter_id=voter_id).values_list('election_id', flat=True)
+    )
+
     context = {
         'voter': voter,
         'active_elections': active_elections,
-        'voted_elections': list(voted_elections)
+        'voted_elections': voted_elections
     }
     return render(request, 'dashboard.html', context)
 
@@ -97,7 +172,10 @@ def vote_page(request, election_id):
     if not voter_id:
         return redirect('index')
     
-    voter = get_object_or_404(Voter, id=voter_id)
+    voter = get_object_or_404(
+        Voter.objects.select_related('state', 'constituency__state').defer('face_encoding'),
+        id=voter_id,
+    )
     election = get_object_or_404(Election, id=election_id)
     
     # Check if election is active
@@ -108,11 +186,14 @@ def vote_page(request, election_id):
     if Vote.objects.filter(voter=voter, election=election).exists():
         return redirect('dashboard')
     
-    # Get candidates for voter's constituency
+    # Get candidates for voter's constituency; the template shows each
+    # candidate's constituency, so join it instead of a query per row.
+    # Tallies ride along as one GROUP BY so any get_vote_count call is
+    # free instead of a COUNT per candidate
     candidates = Candidate.objects.filter(
         election=election,
         constituency=voter.constituency
-    )
+    ).select_related('constituency').annotate(vote_count=Count('votes'))
     
     context = {
         'election': election,
@@ -122,79 +203,124 @@ def vote_page(request, election_id):
     return render(request, 'vote.html', context)
 
 
-@csrf_exempt
-def api_cast_vote(request):
-    """API endpoint to cast vote"""
+async def api_cast_vote(request):
+    """API endpoint to cast vote.
+
+    The request path only validates and commits the Vote row; the
+    blockchain mining — which used to dominate the request — happens on
+    the write-behind queue (see voting.blockchain_queue) after the
+    response is sent. Async so the ORM calls use the native async API
+    under an ASGI server.
+    """
     if request.method != 'POST':
-        return JsonResponse({'success': False, 'message': 'Invalid request method'})
-    
+        return _json_response({'success': False, 'message': 'Invalid request method'})
+
     try:
-        voter_id = request.session.get('voter_id')
+        voter_id = await sync_to_async(request.session.get)('voter_id')
         if not voter_id:
-            return JsonResponse({'success': False, 'message': 'Not logged in'})
-        
-        data = json.loads(request.body)
+            return _json_response({'success': False, 'message': 'Not logged in'})
+
+        data = _json_loads(request.body)
         election_id = data.get('election_id')
         candidate_id = data.get('candidate_id')
-        
-        voter = Voter.objects.get(id=voter_id)
-        election = Election.objects.get(id=election_id)
-        candidate = Candidate.objects.get(id=candidate_id)
-        
+
+        # One JOINed fetch covers the candidate, its election and its
+        # constituency; filtering on election_id also rejects a
+        # candidate from another election without a separate check
+        try:
+            candidate = await Candidate.objects.select_related(
+                'election', 'constituency'
+            ).aget(id=candidate_id, election_id=election_id)
+        except Candidate.DoesNotExist:
+            return _json_response({'success': False, 'message': 'Invalid candidate for this election'})
+        election = candidate.election
+
+        # The validation and the receipt only need three voter columns
+        voter = await Voter.objects.only('id', 'constituency_id', 'aadhaar_number').aget(id=voter_id)
+
         # Validate
         if not election.is_active():
-            return JsonResponse({'success': False, 'message': 'Election is not active'})
-        
-        if Vote.objects.filter(voter=voter, election=election).exists():
-            return JsonResponse({'success': False, 'message': 'You have already voted'})
-        
-        if candidate.constituency != voter.constituency:
-            return JsonResponse({'success': False, 'message': 'Invalid candidate for your constituency'})
-        
-        # Record vote on blockchain
-        blockchain_result = blockchain_service.cast_vote_to_blockchain(
-            voter_id=voter.aadhaar_number,
-            election_id=election.id,
-            candidate_id=candidate.id
-        )
-        
-        if not blockchain_result['success']:
-            return JsonResponse({'success': False, 'message': 'Blockchain recording failed'})
-        
-        # Create vote record
-        vote = Vote.objects.create(
-            voter=voter,
-            election=election,
-            candidate=candidate,
-            blockchain_hash=blockchain_result['block_hash'],
-            transaction_hash=blockchain_result['transaction_hash'],
-            ip_address=request.META.get('REMOTE_ADDR', '127.0.0.1'),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')
-        )
-        
-        # Mark voter as voted
-        voter.has_voted = True
-        voter.save()
-        
-        # Generate receipt
+            return _json_response({'success': False, 'message': 'Election is not active'})
+
+        # Cheap pre-check so a duplicate attempt gets a clean answer
+        # without an insert; the unique constraint below is the real guard
+        if await Vote.objects.filter(voter=voter, election=election).aexists():
+            return _json_response({'success': False, 'message': 'You have already voted'})
+
+        if candidate.constituency_id != voter.constituency_id:
+            return _json_response({'success': False, 'message': 'Invalid candidate for your constituency'})
+
+        # Create vote record — the write-ahead row the worker mines
+        # from. The unique (voter, election) constraint closes the race
+        # two concurrent casts could slip through the exists() check
+        # above, without a second query
+        try:
+            vote = await Vote.objects.acreate(
+                voter=voter,
+                election=election,
+                candidate=candidate,
+                blockchain_status='pending',
+                ip_address=request.META.get('REMOTE_ADDR', '127.0.0.1'),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')
+            )
+        except IntegrityError:
+            return _json_response({'success': False, 'message': 'You have already voted'})
+
+        # Mark voter as voted — one single-column UPDATE rather than a
+        # full save() that rewrites every column including the
+        # face_encoding blob
+        await Voter.objects.filter(pk=voter.pk).aupdate(has_voted=True)
+
+        # Hand the mining to the write-behind worker and answer now.
+        # The receipt is SHA-256 over local data, so it doesn't need
+        # the block; api_vote_status serves the hashes once mined
+        enqueue_vote(vote.id)
         receipt_hash = vote.generate_receipt_hash()
-        
-        return JsonResponse({
+
+        return _json_response({
             'success': True,
             'message': 'Vote cast successfully',
-            'blockchain_hash': blockchain_result['block_hash'],
-            'transaction_hash': blockchain_result['transaction_hash'],
+            'vote_id': vote.id,
+            'blockchain_status': 'pending',
             'receipt_hash': receipt_hash,
             'timestamp': vote.cast_at.isoformat()
         })
         
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'success': False,
             'message': f'Failed to cast vote: {str(e)}'
         })
 
 
+api_cast_vote.csrf_exempt = True
+
+
+def api_vote_status(request, vote_id):
+    """Blockchain recording status for a vote this voter cast.
+
+    The cast response returns before the block is mined; the page polls
+    here until the status flips to confirmed and the hashes appear.
+    """
+    voter_id = request.session.get('voter_id')
+    if not voter_id:
+        return _json_response({'success': False, 'message': 'Not logged in'})
+
+    try:
+        vote = Vote.objects.only(
+            'blockchain_status', 'blockchain_hash', 'transaction_hash'
+        ).get(id=vote_id, voter_id=voter_id)
+    except Vote.DoesNotExist:
+        return _json_response({'success': False, 'message': 'Vote not found'})
+
+    return _json_response({
+        'success': True,
+        'blockchain_status': vote.blockchain_status,
+        'blockchain_hash': vote.blockchain_hash,
+        'transaction_hash': vote.transaction_hash,
+    })
+
+
 def logout_view(request):
     """Logout user"""
     request.session.flush()